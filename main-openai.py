@@ -1,17 +1,96 @@
+import argparse
+import hashlib
+import itertools
+import json
+import logging
 import os
 import re
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-import PyPDF2
+import httpx
+import pypdfium2 as pdfium
 from openai import OpenAI
 from dotenv import load_dotenv
-from datetime import datetime
-from typing import Optional
+from typing import Callable, Dict, List, Optional
+
+
+log = logging.getLogger(__name__)
+
+# Process number format: NNNNNNN-NN.YYYY.N.NN.NNNN
+_PROCESS_RE = re.compile(r'\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4}')
+
+# Horizontal rule framing the stage headers in the log output.
+_RULE = "=" * 80
+
+# Sequence number appended to timestamps (see generate_timestamp).
+_timestamp_counter = itertools.count()
+
+# Number of PDFs processed concurrently.  Each worker spends most of its time
+# blocked on network I/O, so threads overlap the API calls well.
+MAX_WORKERS = 8
+
+# Upper bound on in-flight API requests across all workers, to stay within
+# the provider's rate limits.
+MAX_CONCURRENT_REQUESTS = 4
+_request_slots = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+
+# Serializes all calls into PDFium, which must not be used from two threads
+# at once (see extract_text_from_pdf).
+_pdfium_lock = threading.Lock()
+
+# Thresholds below which the review stage is skipped (see needs_review).
+REVIEW_SKIP_MAX_CHARS = 2000
+REVIEW_SKIP_MAX_SENTENCES = 10
+REVIEW_SKIP_MIN_UNIQUE_RATIO = 0.95
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+_PISO_RE = re.compile(r'\b(?:juiz|sentença) de piso\b', re.IGNORECASE)
+
+# First-stage responses shorter than this are reviewed by the lighter model;
+# override with --light-review-max-chars.
+LIGHT_REVIEW_MAX_CHARS = 1500
+
+# Longer documents are cut down to their head (the appeal's arguments) and
+# tail (the final requests) before being sent to the model.
+MAX_CHARS = 60_000
+HEAD_CHARS = 40_000
+TAIL_CHARS = 20_000
+
+# Seconds between status checks while waiting for a Batch API job.
+BATCH_POLL_INTERVAL = 60
+
+# Static instructions for each stage.  They are sent ahead of the variable
+# document text so the provider can reuse its cached prefix across calls.
+_PROMPT_STAGE1 = """Atue como um excelente assistente jurídico de um juiz federal. Liste os principais argumentos do recurso a seguir. Não use itens, tópicos, markdown ou bullet points. Não utilize \"o recurso\" alega, etc. Utilize o autor (a autora ou o INSS, a depender do caso, você deve determinar quem é o autor ou a autora do recurso) relata, afirma, alega, aduz, assinala, etc ... Não diga sentença monocrática, pois, sentença, por definição é monocrática. Ao mencionar decisão do juízo a quo, diga apenas sentença ou decisão recorrida. Não mencione o nome por extenso da parte autora. Inicie com \"Trata-se de recurso interposto pela parte autora\" (ou pelo INSS ...).Não diga \"Trata-se de recurso interposto contra sentença\", diga \"Trata-se de recurso interposto de sentença ...\" Não esqueça de relatar qual é o pedido final formulado no recurso ao final do texto que você escreverá. Segue o texto do recurso para sua análise:"""
+
+_PROMPT_STAGE2 = """Atue como um excelente assistente jurídico de um juiz federal. Sua função é apenas aprimorar o texto a seguir. Não é preciso expandi-lo ou transforma-lo em uma petição. O texto deve iniciar com Trata-se de recurso inominado interposto por ... de sentença ... Você deve apenas aprimorar a redação, principalmente evitando repetições. O texto a seguir constitui um resumo, uma listagem dos principais argumentos de um recurso. Elimine repetições que prejudiquem a boa leitura do texto. Não utilize itens, tópicos ou markdown na resposta. Não utilize \"juiz de piso\" ou \"sentença de piso\". Se encontrar essas expressões, substitua-as por Juízo de origem ou sentença ou sentença recorrida. """
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """
+    Write a cache file through a temporary file and rename it into place.
+
+    Concurrent workers therefore never read a half-written entry.
+
+    Args:
+        path: Destination file.
+        data: Bytes to write.
+    """
+    tmp_path = path.with_name(f"{path.stem}.{threading.get_ident()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
 
 
 def extract_text_from_pdf(pdf_path: Path) -> str:
     """
     Extract text content from a PDF file.
 
+    The extracted text is cached in a ".cache" folder next to the PDF, keyed
+    by the hash of the file contents, so unchanged PDFs are parsed only once.
+
     Args:
         pdf_path: Path to the PDF file.
 
@@ -19,14 +98,37 @@ def extract_text_from_pdf(pdf_path: Path) -> str:
         Extracted text from the PDF, or an empty string on error.
     """
     try:
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text()
-            return text
+        # One bulk read; PDFium then parses from memory instead of the file
+        data = pdf_path.read_bytes()
+        cache_dir = pdf_path.parent / ".cache"
+        cache_path = cache_dir / f"{hashlib.sha256(data).hexdigest()}.txt"
+        # Raw bytes on both sides: text mode would turn PDFium's \r\n line
+        # breaks into \n, so a cache hit would differ from a fresh extraction.
+        if cache_path.exists():
+            return cache_path.read_bytes().decode("utf-8")
+
+        # PDFium is not thread-safe, even across documents, so only one
+        # worker may be inside it at a time.  Every handle is closed before
+        # the lock is released so no finalizer runs PDFium code later.
+        with _pdfium_lock:
+            pdf = pdfium.PdfDocument(data)
+            try:
+                parts = []
+                for page in pdf:
+                    textpage = page.get_textpage()
+                    parts.append(textpage.get_text_range() or "")
+                    textpage.close()
+                    page.close()
+                text = "".join(parts)
+            finally:
+                pdf.close()
+
+        if text:
+            cache_dir.mkdir(exist_ok=True)
+            write_atomic(cache_path, text.encode("utf-8"))
+        return text
     except Exception as e:
-        print(f"Error extracting text from {pdf_path}: {e}")  # Consider logging instead of printing
+        log.error("Error extracting text from %s: %s", pdf_path, e)
         return ""
 
 
@@ -40,31 +142,190 @@ def extract_process_number(text: str) -> Optional[str]:
     Returns:
         Process number if found, None otherwise.
     """
-    pattern = r'\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4}'
-    match = re.search(pattern, text)
+    match = _PROCESS_RE.search(text)
     return match.group(0) if match else None
 
 
+def response_cache_key(model_name: str, prompt: str, content: str) -> str:
+    """
+    Build the response-cache key for a model call.
+
+    Args:
+        model_name: Name of the model that produces the response.
+        prompt: Static instructions sent with the content.
+        content: Variable content sent to the model.
+
+    Returns:
+        Hex SHA-256 digest identifying the call.
+    """
+    digest = hashlib.sha256()
+    for part in (model_name, prompt, content):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def load_cached_response(output_dir: Path, key: str) -> Optional[str]:
+    """
+    Look up a previously saved model response.
+
+    Args:
+        output_dir: Output directory holding the ".cache" folder.
+        key: Cache key from response_cache_key().
+
+    Returns:
+        The cached response text, or None on a cache miss.
+    """
+    cache_path = output_dir / ".cache" / f"{key}.json"
+    try:
+        return json.loads(cache_path.read_text(encoding="utf-8"))["response"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def save_cached_response(output_dir: Path, key: str, response: str) -> None:
+    """
+    Save a model response so identical calls can skip the API.
+
+    Args:
+        output_dir: Output directory holding the ".cache" folder.
+        key: Cache key from response_cache_key().
+        response: Response text to store.
+    """
+    cache_dir = output_dir / ".cache"
+    cache_dir.mkdir(exist_ok=True)
+    write_atomic(cache_dir / f"{key}.json",
+                 json.dumps({"response": response}, ensure_ascii=False).encode("utf-8"))
+
+
+def truncate_text(text: str) -> str:
+    """
+    Shorten long documents to their first and last parts.
+
+    Args:
+        text: Extracted document text.
+
+    Returns:
+        The text unchanged if it fits in MAX_CHARS, otherwise its first
+        HEAD_CHARS and last TAIL_CHARS characters joined by a marker.
+    """
+    if len(text) <= MAX_CHARS:
+        return text
+    return f"{text[:HEAD_CHARS]}\n[...omitted...]\n{text[-TAIL_CHARS:]}"
+
+
+def log_section(title: str, *args) -> None:
+    """
+    Log a section header framed by horizontal rules.
+
+    Args:
+        title: Header message, with %-style placeholders for args.
+        *args: Values for the placeholders, formatted only if the message
+            is emitted.
+    """
+    log.info("\n%s\n" + title + "\n%s\n", _RULE, *args, _RULE)
+
+
 def generate_timestamp() -> str:
     """
     Generate a timestamp string for use in filenames.
 
+    A per-run sequence number is appended so PDFs that finish within the
+    same second never share a filename.
+
+    Returns:
+        Timestamp in format YYYYMMDD_HHMMSS_NNNN.
+    """
+    return f"{time.strftime('%Y%m%d_%H%M%S')}_{next(_timestamp_counter):04d}"
+
+
+def stage1_request(text_content: str) -> dict:
+    """
+    Build the chat-completion parameters for the first-stage analysis.
+
+    Args:
+        text_content: Text content to be processed.
+
+    Returns:
+        Keyword arguments for client.chat.completions.create, also usable
+        as the body of a Batch API request.
+    """
+    return {
+        "model": "gpt-4o-mini",
+        "messages": [
+            {"role": "system", "content": _PROMPT_STAGE1},
+            {"role": "user", "content": text_content}
+        ],
+        "temperature": 0.5,
+        "max_completion_tokens": 2000,
+        "top_p": 1,
+        "frequency_penalty": 0,
+        "presence_penalty": 0,
+    }
+
+
+def stage2_request(initial_response: str, light_review_max_chars: int) -> dict:
+    """
+    Build the chat-completion parameters for the review stage.
+
+    Args:
+        initial_response: The response from the first API call.
+        light_review_max_chars: Responses shorter than this are reviewed with
+            gpt-4o-mini instead of o3-mini.
+
+    Returns:
+        Keyword arguments for client.chat.completions.create, also usable
+        as the body of a Batch API request.
+    """
+    messages = [
+        {"role": "system", "content": _PROMPT_STAGE2},
+        {"role": "user", "content": initial_response}
+    ]
+    # Short responses do not need the heavier (and pricier) reasoning model.
+    if len(initial_response) < light_review_max_chars:
+        return {"model": "gpt-4o-mini", "messages": messages}
+    return {
+        "model": "o3-mini",  # Using a more powerful model for the review stage
+        "messages": messages,
+        "reasoning_effort": "low",
+    }
+
+
+def save_response(output_dir: Path, base_name: str, process_number: Optional[str],
+                  timestamp: str, response: str, suffix: str = "") -> Path:
+    """
+    Save a model response using the output filename scheme.
+
+    Args:
+        output_dir: Directory to save the output.
+        base_name: PDF file name without extension (for fallback filename).
+        process_number: Process number if found, None otherwise.
+        timestamp: Timestamp shared by all output files of the PDF.
+        response: Response text to save.
+        suffix: Inserted before the timestamp, e.g. "_improved".
+
     Returns:
-        Timestamp in format YYYYMMDD_HHMMSS.
+        Path of the saved file.
     """
-    return datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"{process_number or base_name}{suffix}_{timestamp}.txt"
+    filepath = output_dir / filename
+
+    filepath.write_text(response, encoding='utf-8')
+    return filepath
 
 
-def process_with_openai(text_content: str, output_dir: Path, pdf_name: str,
-                       process_number: Optional[str], client: OpenAI) -> str:
+def process_with_openai(text_content: str, output_dir: Path, base_name: str,
+                       process_number: Optional[str], timestamp: str,
+                       client: OpenAI) -> str:
     """
     Process text content using OpenAI API for first-stage analysis.
 
     Args:
         text_content: Text content to be processed.
         output_dir: Directory to save the output.
-        pdf_name: Name of the original PDF file (for fallback filename).
+        base_name: PDF file name without extension (for fallback filename).
         process_number: Process number if found, None otherwise.
+        timestamp: Timestamp shared by all output files of this PDF.
         client: Configured OpenAI client.
 
     Returns:
@@ -72,59 +333,41 @@ def process_with_openai(text_content: str, output_dir: Path, pdf_name: str,
         string on error.
     """
     try:
-        prompt = """Atue como um excelente assistente jurídico de um juiz federal. Liste os principais argumentos do recurso a seguir. Não use itens, tópicos, markdown ou bullet points. Não utilize \"o recurso\" alega, etc. Utilize o autor (a autora ou o INSS, a depender do caso, você deve determinar quem é o autor ou a autora do recurso) relata, afirma, alega, aduz, assinala, etc ... Não diga sentença monocrática, pois, sentença, por definição é monocrática. Ao mencionar decisão do juízo a quo, diga apenas sentença ou decisão recorrida. Não mencione o nome por extenso da parte autora. Inicie com \"Trata-se de recurso interposto pela parte autora\" (ou pelo INSS ...).Não diga \"Trata-se de recurso interposto contra sentença\", diga \"Trata-se de recurso interposto de sentença ...\" Não esqueça de relatar qual é o pedido final formulado no recurso ao final do texto que você escreverá. Segue o texto do recurso para sua análise:"""
-        user_message = f"{prompt}\n\n{text_content}"
-
-        print(f"\n{'='*80}\nStage 1: Generating initial response with OpenAI\n{'='*80}\n")
-
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": user_message
-                        }
-                    ]
-                }
-            ],
-            response_format={
-                "type": "text"
-            },
-            temperature=0.5,
-            max_completion_tokens=2000,
-            top_p=1,
-            frequency_penalty=0,
-            presence_penalty=0
-)
-        
-
-        # Extract the text from the response
-        full_response = response.choices[0].message.content
-        print(full_response)
-        print(f"\n{'='*80}\n")
-
-        timestamp = generate_timestamp()
-        base_name = Path(pdf_name).stem
-        filename = f"{process_number or base_name}_{timestamp}.txt"
-        filepath = output_dir / filename
-
-        with open(filepath, 'w', encoding='utf-8') as file:
-            file.write(full_response)
-
-        print(f"Initial response saved to: {filepath}")
+        log_section("Stage 1: Generating initial response with OpenAI (%s)", base_name)
+
+        request = stage1_request(text_content)
+        cache_key = response_cache_key(request["model"], _PROMPT_STAGE1, text_content)
+        full_response = load_cached_response(output_dir, cache_key)
+
+        if full_response is not None:
+            log.info("Using cached response.")
+        else:
+            with _request_slots:
+                response = client.chat.completions.create(**request)
+
+            # Extract the text from the response
+            full_response = response.choices[0].message.content
+            if full_response:
+                save_cached_response(output_dir, cache_key, full_response)
+
+        log.debug("%s", full_response)
+        log.info("\n%s\n", _RULE)
+
+        filepath = save_response(output_dir, base_name, process_number, timestamp,
+                                 full_response)
+
+        log.info("Initial response saved to: %s", filepath)
         return full_response
 
     except Exception as e:
-        print(f"Error processing with OpenAI API: {e}")
+        log.error("Error processing with OpenAI API: %s", e)
         return ""
 
 
 def review_with_openai(initial_response: str, output_dir: Path,
-                      process_number: Optional[str], pdf_name: str,
-                      client: OpenAI) -> None:
+                      process_number: Optional[str], base_name: str,
+                      timestamp: str, client: OpenAI,
+                      light_review_max_chars: int) -> None:
     """
     Review and improves the initial response using the OpenAI model.
 
@@ -132,60 +375,301 @@ def review_with_openai(initial_response: str, output_dir: Path,
         initial_response: The response from the first API call.
         output_dir: Directory to save the output.
         process_number: The process number for the filename.
-        pdf_name: Name of the original PDF file (for fallback filename).
+        base_name: PDF file name without extension (for fallback filename).
+        timestamp: Timestamp shared by all output files of this PDF.
         client: Configured OpenAI client.
+        light_review_max_chars: Responses shorter than this use the lighter
+            review model.
 
     Returns:
         None. Prints and saves the improved response.
     """
     try:
-        print(f"\n{'='*80}\nStage 2: Reviewing and improving the response with OpenAI\n{'='*80}\n")
-
-        review_prompt = """Atue como um excelente assistente jurídico de um juiz federal. Sua função é apenas aprimorar o texto a seguir. Não é preciso expandi-lo ou transforma-lo em uma petição. O texto deve iniciar com Trata-se de recurso inominado interposto por ... de sentença ... Você deve apenas aprimorar a redação, principalmente evitando repetições. O texto a seguir constitui um resumo, uma listagem dos principais argumentos de um recurso. Elimine repetições que prejudiquem a boa leitura do texto. Não utilize itens, tópicos ou markdown na resposta. Não utilize \"juiz de piso\" ou \"sentença de piso\". Se encontrar essas expressões, substitua-as por Juízo de origem ou sentença ou sentença recorrida. """
-        user_message = f"{review_prompt}\n\n{initial_response}"
-
-        response = client.chat.completions.create(
-            model="o3-mini",  # Using a more powerful model for the review stage
-            messages=[
-                {
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": user_message
-                        }
-                    ]
-                }
-            ],
-            response_format={
-                "type": "text"
-            },
-            reasoning_effort="low"  # Using higher reasoning effort for the review stage
-        )
+        log_section("Stage 2: Reviewing and improving the response with OpenAI (%s)", base_name)
 
-        # Extract the text from the response
-        improved_response = response.choices[0].message.content
-        print(improved_response)
-        print(f"\n{'='*80}\n")
+        request = stage2_request(initial_response, light_review_max_chars)
+        cache_key = response_cache_key(request["model"], _PROMPT_STAGE2, initial_response)
+        improved_response = load_cached_response(output_dir, cache_key)
 
-        timestamp = generate_timestamp()
-        base_name = Path(pdf_name).stem
-        filename = f"{process_number or base_name}_improved_{timestamp}.txt"
-        filepath = output_dir / filename
+        if improved_response is not None:
+            log.info("Using cached response.")
+        else:
+            with _request_slots:
+                response = client.chat.completions.create(**request)
 
-        with open(filepath, 'w', encoding='utf-8') as file:
-            file.write(improved_response)
+            # Extract the text from the response
+            improved_response = response.choices[0].message.content
+            if improved_response:
+                save_cached_response(output_dir, cache_key, improved_response)
 
-        print(f"Improved response saved to: {filepath}")
+        log.debug("%s", improved_response)
+        log.info("\n%s\n", _RULE)
+
+        filepath = save_response(output_dir, base_name, process_number, timestamp,
+                                 improved_response, suffix="_improved")
+
+        log.info("Improved response saved to: %s", filepath)
 
     except Exception as e:
-        print(f"Error in second-stage processing: {e}")
+        log.error("Error in second-stage processing: %s", e)
+
+
+def needs_review(initial_response: str) -> bool:
+    """
+    Decide whether the first-stage response is worth a review call.
+
+    Short responses with no repeated sentences and none of the expressions
+    the review prompt rewrites gain little from the second stage.
+
+    Args:
+        initial_response: The response from the first API call.
+
+    Returns:
+        True if the review stage should run, False if it can be skipped.
+    """
+    if len(initial_response) >= REVIEW_SKIP_MAX_CHARS:
+        return True
+    if _PISO_RE.search(initial_response):
+        return True
+
+    sentences = [s for s in _SENTENCE_SPLIT_RE.split(initial_response.strip()) if s]
+    if not sentences or len(sentences) >= REVIEW_SKIP_MAX_SENTENCES:
+        return True
+    return len(set(sentences)) / len(sentences) <= REVIEW_SKIP_MIN_UNIQUE_RATIO
+
+
+def process_pdf(pdf_path: Path, output_dir: Path, client: OpenAI,
+                light_review_max_chars: int,
+                review_executor: ThreadPoolExecutor) -> Optional[Future]:
+    """
+    Run extraction and the first stage for one PDF, then queue its review.
+
+    The review is submitted to a separate executor so this worker can move
+    on to the next PDF while the review call is still in flight.
+
+    Args:
+        pdf_path: Path to the PDF file.
+        output_dir: Directory to save the output.
+        client: Configured OpenAI client.
+        light_review_max_chars: Responses shorter than this use the lighter
+            review model.
+        review_executor: Executor that runs the review stage.
+
+    Returns:
+        Future for the queued review, or None if the PDF or its review was
+        skipped.
+    """
+    log.info("\nProcessing: %s", pdf_path.name)
+    text_content = extract_text_from_pdf(pdf_path)
+
+    if not text_content:
+        log.warning("Skipping %s: No text content extracted.", pdf_path.name)
+        return None
+
+    log.info("Successfully extracted %d characters from %s.", len(text_content), pdf_path.name)
+
+    process_number = extract_process_number(text_content)
+    if process_number:
+        log.info("Process number extracted from PDF: %s", process_number)
+    else:
+        log.info("No process number found in %s.", pdf_path.name)
+
+    if len(text_content) > MAX_CHARS:
+        log.info("Truncating %s from %d to about %d characters.", pdf_path.name, len(text_content), MAX_CHARS)
+        text_content = truncate_text(text_content)
+
+    # Both stages share one timestamp so their output files can be matched.
+    timestamp = generate_timestamp()
+    initial_response = process_with_openai(text_content, output_dir,
+                                           pdf_path.stem, process_number,
+                                           timestamp, client)
+
+    if not initial_response:
+        return None
+
+    if not needs_review(initial_response):
+        log.info("Skipping review for %s: initial response is short and has no repetitions.", pdf_path.name)
+        return None
+
+    return review_executor.submit(review_with_openai, initial_response, output_dir,
+                                  process_number, pdf_path.stem, timestamp, client,
+                                  light_review_max_chars)
+
+
+def run_batch(client: OpenAI, requests: Dict[str, dict]) -> Dict[str, str]:
+    """
+    Run chat-completion requests through the OpenAI Batch API.
+
+    Blocks, polling every BATCH_POLL_INTERVAL seconds, until the batch
+    finishes.  Batches complete within 24 hours at half the regular price.
+
+    Args:
+        client: Configured OpenAI client.
+        requests: Request parameters keyed by custom_id.
+
+    Returns:
+        Response text for each custom_id whose request succeeded.
+    """
+    lines = (json.dumps({"custom_id": custom_id, "method": "POST",
+                         "url": "/v1/chat/completions", "body": body},
+                        ensure_ascii=False)
+             for custom_id, body in requests.items())
+    batch_file = client.files.create(
+        file=("batch.jsonl", "\n".join(lines).encode("utf-8")),
+        purpose="batch"
+    )
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    log.info("Submitted batch %s with %d request(s).", batch.id, len(requests))
+
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        time.sleep(BATCH_POLL_INTERVAL)
+        batch = client.batches.retrieve(batch.id)
+        log.info("Batch %s: %s", batch.id, batch.status)
+
+    # A failed batch was rejected as a whole (e.g. invalid input file).
+    if batch.status == "failed" and batch.errors and batch.errors.data:
+        for error in batch.errors.data:
+            log.error("Error: batch %s failed: %s (%s)", batch.id, error.message, error.code)
+
+    # Successful requests land in the output file, failed ones in the error
+    # file; expired or cancelled batches may still carry partial results.
+    results = {}
+    failed = set()
+    for file_id in (batch.output_file_id, batch.error_file_id):
+        if not file_id:
+            continue
+        for line in client.files.content(file_id).text.splitlines():
+            record = json.loads(line)
+            response = record.get("response") or {}
+            if response.get("status_code") != 200:
+                log.error("Error in batch request %s: %s", record['custom_id'],
+                          record.get('error') or response.get('body'))
+                failed.add(record["custom_id"])
+                continue
+            results[record["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+
+    missing = requests.keys() - results.keys() - failed
+    if missing:
+        log.error("Error: batch %s finished as '%s' with no result for: %s",
+                  batch.id, batch.status, ", ".join(sorted(missing)))
+    return results
+
+
+def run_batch_stage(client: OpenAI, output_dir: Path, inputs: Dict[str, str],
+                    build_request: Callable[[str], dict]) -> Dict[str, str]:
+    """
+    Run one stage for several inputs as a single batch, reusing cached responses.
+
+    Args:
+        client: Configured OpenAI client.
+        output_dir: Output directory holding the response cache.
+        inputs: Variable content sent to the model, keyed by PDF name.
+        build_request: Builds the request parameters for one input.
+
+    Returns:
+        Response text for each PDF name that has a cached or new response.
+    """
+    results = {}
+    pending = {}
+    cache_keys = {}
+    for pdf_name, content in inputs.items():
+        request = build_request(content)
+        prompt = request["messages"][0]["content"]
+        cache_keys[pdf_name] = response_cache_key(request["model"], prompt, content)
+        cached = load_cached_response(output_dir, cache_keys[pdf_name])
+        if cached is not None:
+            results[pdf_name] = cached
+        else:
+            pending[pdf_name] = request
+
+    if pending:
+        for pdf_name, response in run_batch(client, pending).items():
+            if response:
+                save_cached_response(output_dir, cache_keys[pdf_name], response)
+                results[pdf_name] = response
+    return results
+
+
+def process_batch(pdf_files: List[Path], output_dir: Path, client: OpenAI,
+                  light_review_max_chars: int) -> None:
+    """
+    Process all PDFs through the Batch API, with one batch per stage.
+
+    Args:
+        pdf_files: PDF files to process.
+        output_dir: Directory to save the output.
+        client: Configured OpenAI client.
+        light_review_max_chars: Responses shorter than this use the lighter
+            review model.
+
+    Returns:
+        None. Both stages save their own output files.
+    """
+    texts = {}
+    # Output naming for each PDF: (base_name, process_number, timestamp)
+    output_names = {}
+    for pdf_path in pdf_files:
+        text_content = extract_text_from_pdf(pdf_path)
+        if not text_content:
+            log.warning("Skipping %s: No text content extracted.", pdf_path.name)
+            continue
+        output_names[pdf_path.name] = (pdf_path.stem, extract_process_number(text_content),
+                                       generate_timestamp())
+        texts[pdf_path.name] = truncate_text(text_content)
+
+    log_section("Stage 1: Generating initial responses with the OpenAI Batch API")
+    initial_responses = run_batch_stage(client, output_dir, texts, stage1_request)
+    for pdf_name, response in initial_responses.items():
+        filepath = save_response(output_dir, *output_names[pdf_name], response)
+        log.info("Initial response saved to: %s", filepath)
+
+    to_review = {pdf_name: response for pdf_name, response in initial_responses.items()
+                 if needs_review(response)}
+    if not to_review:
+        return
+
+    log_section("Stage 2: Reviewing the responses with the OpenAI Batch API")
+    improved_responses = run_batch_stage(client, output_dir, to_review,
+                                         partial(stage2_request,
+                                                 light_review_max_chars=light_review_max_chars))
+    for pdf_name, response in improved_responses.items():
+        filepath = save_response(output_dir, *output_names[pdf_name], response,
+                                 suffix="_improved")
+        log.info("Improved response saved to: %s", filepath)
 
 
 def main():
     """
     Main function to process all PDF files in the 'docs' folder.
     """
+    parser = argparse.ArgumentParser(
+        description="Summarize the appeals in the 'docs' folder with OpenAI."
+    )
+    parser.add_argument(
+        "--batch", action="store_true",
+        help="submit all PDFs through the OpenAI Batch API (half price, "
+             "results within 24 hours) instead of one request per file"
+    )
+    parser.add_argument(
+        "--light-review-max-chars", type=int, default=LIGHT_REVIEW_MAX_CHARS,
+        help="review first-stage responses shorter than this many characters "
+             "with the lighter gpt-4o-mini model instead of o3-mini "
+             "(default: %(default)s; 0 always uses o3-mini)"
+    )
+    args = parser.parse_args()
+
+    # Set LOGLEVEL=DEBUG to also print the model responses as they arrive.
+    level_name = os.environ.get("LOGLEVEL", "INFO").upper()
+    level = getattr(logging, level_name, None)
+    logging.basicConfig(level=level if isinstance(level, int) else logging.INFO,
+                        format="%(message)s", stream=sys.stdout)
+    if not isinstance(level, int):
+        log.warning("Unknown LOGLEVEL '%s'; using INFO.", level_name)
+
     load_dotenv()
     
     # Get OpenAI API credentials from environment
@@ -193,20 +677,27 @@ def main():
     project = os.environ.get("OPENAI_PROJECT")
     
     if not organization or not project:
-        print("Error: OPENAI_ORGANIZATION or OPENAI_PROJECT environment variables are not set.")
-        print("Please add them to your .env file as:")
-        print("OPENAI_ORGANIZATION=your org")
-        print("OPENAI_PROJECT=your projct")
+        log.error("Error: OPENAI_ORGANIZATION or OPENAI_PROJECT environment variables are not set.")
+        log.error("Please add them to your .env file as:")
+        log.error("OPENAI_ORGANIZATION=your org")
+        log.error("OPENAI_PROJECT=your projct")
         return
 
-    # Initialize OpenAI client
+    # Initialize OpenAI client.  HTTP/2 lets the concurrent workers share
+    # one pooled connection instead of paying a TCP+TLS handshake each.
     try:
+        http_client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+            timeout=600.0
+        )
         client = OpenAI(
             organization=organization,
-            project=project
+            project=project,
+            http_client=http_client
         )
     except Exception as e:
-        print(f"Error initializing OpenAI client: {e}")
+        log.error("Error initializing OpenAI client: %s", e)
         return
 
     current_dir = Path.cwd()
@@ -214,48 +705,47 @@ def main():
     output_dir = current_dir / "responses"
 
     if not docs_dir.exists():
-        print(f"Error: Directory '{docs_dir}' does not exist.")
-        print(f"Creating the directory '{docs_dir}'.")
+        log.error("Error: Directory '%s' does not exist.", docs_dir)
+        log.info("Creating the directory '%s'.", docs_dir)
         docs_dir.mkdir(parents=True, exist_ok=True)
-        print(f"Please place your PDF files in the '{docs_dir}' directory and run the script again.")
+        log.info("Please place your PDF files in the '%s' directory and run the script again.", docs_dir)
         return
 
     output_dir.mkdir(exist_ok=True)
-    print(f"Output will be saved to '{output_dir}'.")
+    log.info("Output will be saved to '%s'.", output_dir)
 
-    pdf_files = list(docs_dir.glob("*.pdf"))
+    # A single scandir pass: entry types come from the directory listing, so
+    # no per-file stat or pattern matching is needed.
+    with os.scandir(docs_dir) as entries:
+        pdf_files = [Path(entry.path) for entry in entries
+                     if entry.is_file() and entry.name.lower().endswith(".pdf")]
 
     if not pdf_files:
-        print(f"No PDF files found in '{docs_dir}'.")
+        log.info("No PDF files found in '%s'.", docs_dir)
         return
 
-    print(f"Found {len(pdf_files)} PDF file(s) in '{docs_dir}'.")
+    log.info("Found %d PDF file(s) in '%s'.", len(pdf_files), docs_dir)
 
-    for pdf_path in pdf_files:
-        print(f"\nProcessing: {pdf_path.name}")
-        text_content = extract_text_from_pdf(pdf_path)
-
-        if not text_content:
-            print(f"Skipping {pdf_path.name}: No text content extracted.")
-            continue
-
-        print(f"Successfully extracted {len(text_content)} characters from {pdf_path.name}.")
-
-        process_number = extract_process_number(text_content)
-        if process_number:
-            print(f"Process number extracted from PDF: {process_number}")
-        else:
-            print("No process number found in the PDF content.")
-
-        initial_response = process_with_openai(text_content, output_dir,
-                                             pdf_path.name, process_number,
-                                             client)
-
-        if initial_response:
-            review_with_openai(initial_response, output_dir,
-                              process_number, pdf_path.name, client)
+    if args.batch:
+        try:
+            process_batch(pdf_files, output_dir, client, args.light_review_max_chars)
+        except Exception as e:
+            log.error("Error in batch processing: %s", e)
+            return
+        log.info("\nAll PDF files processed.")
+        return
 
-    print("\nAll PDF files processed.")
+    # Stage 1 and stage 2 get their own pools, so reviews of finished PDFs
+    # overlap with the first stage of the next ones.  Leaving the block waits
+    # for the first stages, then for every queued review.
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as review_executor, \
+         ThreadPoolExecutor(max_workers=MAX_WORKERS) as stage1_executor:
+        list(stage1_executor.map(partial(process_pdf, output_dir=output_dir, client=client,
+                                         light_review_max_chars=args.light_review_max_chars,
+                                         review_executor=review_executor),
+                                 pdf_files))
+
+    log.info("\nAll PDF files processed.")
 
 
 if __name__ == "__main__":
@@ -1,17 +1,92 @@
+import argparse
+import hashlib
+import itertools
+import json
+import logging
 import os
 import re
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-import PyPDF2
+import pypdfium2 as pdfium
 import google.generativeai as genai
 from dotenv import load_dotenv
-from datetime import datetime
 from typing import Optional
 
 
+log = logging.getLogger(__name__)
+
+# Process number format: NNNNNNN-NN.YYYY.N.NN.NNNN
+_PROCESS_RE = re.compile(r'\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4}')
+
+# Horizontal rule framing the stage headers in the log output.
+_RULE = "=" * 80
+
+# Sequence number appended to timestamps (see generate_timestamp).
+_timestamp_counter = itertools.count()
+
+# Number of PDFs processed concurrently.  Each worker spends most of its time
+# blocked on network I/O, so threads overlap the API calls well.
+MAX_WORKERS = 8
+
+# Upper bound on in-flight API requests across all workers, to stay within
+# the provider's rate limits.
+MAX_CONCURRENT_REQUESTS = 4
+_request_slots = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+
+# Serializes all calls into PDFium, which must not be used from two threads
+# at once (see extract_text_from_pdf).
+_pdfium_lock = threading.Lock()
+
+# Thresholds below which the review stage is skipped (see needs_review).
+REVIEW_SKIP_MAX_CHARS = 2000
+REVIEW_SKIP_MAX_SENTENCES = 10
+REVIEW_SKIP_MIN_UNIQUE_RATIO = 0.95
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+_PISO_RE = re.compile(r'\b(?:juiz|sentença) de piso\b', re.IGNORECASE)
+
+# First-stage responses shorter than this are reviewed by the lighter model;
+# override with --light-review-max-chars.
+LIGHT_REVIEW_MAX_CHARS = 1500
+
+# Longer documents are cut down to their head (the appeal's arguments) and
+# tail (the final requests) before being sent to the model.
+MAX_CHARS = 60_000
+HEAD_CHARS = 40_000
+TAIL_CHARS = 20_000
+
+# Static instructions for each stage.  They are sent ahead of the variable
+# document text so the provider can reuse its cached prefix across calls.
+_PROMPT_STAGE1 = """Atue como um excelente assistente jurídico de um juiz federal. Liste os principais argumentos do recurso a seguir. Não use itens, tópicos, markdown ou bullet points. Não utilize \"o recurso\" alega, etc. Utilize o autor (a autora ou o INSS, a depender do caso, você deve determinar quem é o autor ou a autora do recurso) relata, afirma, alega, aduz, assinala, etc ... Não diga sentença monocrática, pois, sentença, por definição é monocrática. Ao mencionar decisão do juízo a quo, diga apenas sentença ou decisão recorrida. Não mencione o nome por extenso da parte autora. Inicie com \"Trata-se de recurso interposto pela parte autora\" (ou pelo INSS ...).Não diga \"Trata-se de recurso interposto contra sentença\", diga \"Trata-se de recurso interposto de sentença ...\" Não esqueça de relatar qual é o pedido final formulado no recurso ao final do texto que você escreverá. Segue o texto do recurso para sua análise:"""
+
+_PROMPT_STAGE2 = """Atue como um excelente assistente jurídico de um juiz federal. Sua função é apenas aprimorar o texto a seguir. Não é preciso expandi-lo ou transforma-lo em uma petição. O texto deve iniciar com Trata-se de recurso inominado interposto por ... de sentença ... Você deve apenas aprimorar a redação, principalmente evitando repetições. O texto a seguir constitui um resumo, uma listagem dos principais argumentos de um recurso. Elimine repetições que prejudiquem a boa leitura do texto. Não utilize itens, tópicos ou markdown na resposta. Não utilize \"juiz de piso\" ou \"sentença de piso\". Se encontrar essas expressões, substitua-as por Juízo de origem ou sentença ou sentença recorrida. """
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """
+    Write a cache file through a temporary file and rename it into place.
+
+    Concurrent workers therefore never read a half-written entry.
+
+    Args:
+        path: Destination file.
+        data: Bytes to write.
+    """
+    tmp_path = path.with_name(f"{path.stem}.{threading.get_ident()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
 def extract_text_from_pdf(pdf_path: Path) -> str:
     """
     Extract text content from a PDF file.
 
+    The extracted text is cached in a ".cache" folder next to the PDF, keyed
+    by the hash of the file contents, so unchanged PDFs are parsed only once.
+
     Args:
         pdf_path: Path to the PDF file.
 
@@ -19,14 +94,37 @@ def extract_text_from_pdf(pdf_path: Path) -> str:
         Extracted text from the PDF, or an empty string on error.
     """
     try:
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text()
-            return text
+        # One bulk read; PDFium then parses from memory instead of the file
+        data = pdf_path.read_bytes()
+        cache_dir = pdf_path.parent / ".cache"
+        cache_path = cache_dir / f"{hashlib.sha256(data).hexdigest()}.txt"
+        # Raw bytes on both sides: text mode would turn PDFium's \r\n line
+        # breaks into \n, so a cache hit would differ from a fresh extraction.
+        if cache_path.exists():
+            return cache_path.read_bytes().decode("utf-8")
+
+        # PDFium is not thread-safe, even across documents, so only one
+        # worker may be inside it at a time.  Every handle is closed before
+        # the lock is released so no finalizer runs PDFium code later.
+        with _pdfium_lock:
+            pdf = pdfium.PdfDocument(data)
+            try:
+                parts = []
+                for page in pdf:
+                    textpage = page.get_textpage()
+                    parts.append(textpage.get_text_range() or "")
+                    textpage.close()
+                    page.close()
+                text = "".join(parts)
+            finally:
+                pdf.close()
+
+        if text:
+            cache_dir.mkdir(exist_ok=True)
+            write_atomic(cache_path, text.encode("utf-8"))
+        return text
     except Exception as e:
-        print(f"Error extracting text from {pdf_path}: {e}")  # Consider logging instead of printing
+        log.error("Error extracting text from %s: %s", pdf_path, e)
         return ""
 
 
@@ -40,44 +138,152 @@ def extract_process_number(text: str) -> Optional[str]:
     Returns:
         Process number if found, None otherwise.
     """
-    pattern = r'\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4}'
-    match = re.search(pattern, text)
+    match = _PROCESS_RE.search(text)
     return match.group(0) if match else None
 
 
+def response_cache_key(model_name: str, prompt: str, content: str) -> str:
+    """
+    Build the response-cache key for a model call.
+
+    Args:
+        model_name: Name of the model that produces the response.
+        prompt: Static instructions sent with the content.
+        content: Variable content sent to the model.
+
+    Returns:
+        Hex SHA-256 digest identifying the call.
+    """
+    digest = hashlib.sha256()
+    for part in (model_name, prompt, content):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def load_cached_response(output_dir: Path, key: str) -> Optional[str]:
+    """
+    Look up a previously saved model response.
+
+    Args:
+        output_dir: Output directory holding the ".cache" folder.
+        key: Cache key from response_cache_key().
+
+    Returns:
+        The cached response text, or None on a cache miss.
+    """
+    cache_path = output_dir / ".cache" / f"{key}.json"
+    try:
+        return json.loads(cache_path.read_text(encoding="utf-8"))["response"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def save_cached_response(output_dir: Path, key: str, response: str) -> None:
+    """
+    Save a model response so identical calls can skip the API.
+
+    Args:
+        output_dir: Output directory holding the ".cache" folder.
+        key: Cache key from response_cache_key().
+        response: Response text to store.
+    """
+    cache_dir = output_dir / ".cache"
+    cache_dir.mkdir(exist_ok=True)
+    write_atomic(cache_dir / f"{key}.json",
+                 json.dumps({"response": response}, ensure_ascii=False).encode("utf-8"))
+
+
+def truncate_text(text: str) -> str:
+    """
+    Shorten long documents to their first and last parts.
+
+    Args:
+        text: Extracted document text.
+
+    Returns:
+        The text unchanged if it fits in MAX_CHARS, otherwise its first
+        HEAD_CHARS and last TAIL_CHARS characters joined by a marker.
+    """
+    if len(text) <= MAX_CHARS:
+        return text
+    return f"{text[:HEAD_CHARS]}\n[...omitted...]\n{text[-TAIL_CHARS:]}"
+
+
+def log_section(title: str, *args) -> None:
+    """
+    Log a section header framed by horizontal rules.
+
+    Args:
+        title: Header message, with %-style placeholders for args.
+        *args: Values for the placeholders, formatted only if the message
+            is emitted.
+    """
+    log.info("\n%s\n" + title + "\n%s\n", _RULE, *args, _RULE)
+
+
 def generate_timestamp() -> str:
     """
     Generate a timestamp string for use in filenames.
 
+    A per-run sequence number is appended so PDFs that finish within the
+    same second never share a filename.
+
     Returns:
-        Timestamp in format YYYYMMDD_HHMMSS.
+        Timestamp in format YYYYMMDD_HHMMSS_NNNN.
+    """
+    return f"{time.strftime('%Y%m%d_%H%M%S')}_{next(_timestamp_counter):04d}"
+
+
+def collect_stream(response) -> str:
     """
-    return datetime.now().strftime("%Y%m%d_%H%M%S")
+    Collect a streamed Gemini response, logging it at DEBUG level as it arrives.
+
+    Chunks are buffered and logged a whole line at a time, which keeps the
+    number of writes low and stops concurrent workers from interleaving
+    output mid-line.  Nothing is buffered when DEBUG logging is disabled.
 
+    Args:
+        response: Iterable of chunks returned by generate_content(stream=True).
 
-def process_with_gemini(text_content: str, output_dir: Path, pdf_name: str,
-                       process_number: Optional[str], api_key: str) -> str:
+    Returns:
+        The concatenated response text.
+    """
+    echo = log.isEnabledFor(logging.DEBUG)
+    parts = []
+    pending = ""
+    for chunk in response:
+        #  Handle the chunk.text more robustly.  It *could* be None.
+        if hasattr(chunk, 'text') and chunk.text:
+            parts.append(chunk.text)
+            if echo:
+                lines, newline, pending = (pending + chunk.text).rpartition("\n")
+                if newline:
+                    log.debug("%s", lines)
+    if echo and pending:
+        log.debug("%s", pending)
+    return "".join(parts)
+
+
+def process_with_gemini(text_content: str, output_dir: Path, base_name: str,
+                       process_number: Optional[str], timestamp: str,
+                       model: genai.GenerativeModel) -> str:
     """
     Process text content using Google Gemini API for first-stage analysis.
 
     Args:
         text_content: Text content to be processed.
         output_dir: Directory to save the output.
-        pdf_name: Name of the original PDF file (for fallback filename).
+        base_name: PDF file name without extension (for fallback filename).
         process_number: Process number if found, None otherwise.
-        api_key: The API key to use for Gemini.
+        timestamp: Timestamp shared by all output files of this PDF.
+        model: Configured Gemini model for the first stage.
 
     Returns:
         The full response text for second-stage processing, or an empty
         string on error.  Returns an empty string if *any* error occurs.
     """
     try:
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel("gemini-2.0-flash-lite")  # Consider model as parameter
-
-        prompt = """Atue como um excelente assistente jurídico de um juiz federal. Liste os principais argumentos do recurso a seguir. Não use itens, tópicos, markdown ou bullet points. Não utilize \"o recurso\" alega, etc. Utilize o autor (a autora ou o INSS, a depender do caso, você deve determinar quem é o autor ou a autora do recurso) relata, afirma, alega, aduz, assinala, etc ... Não diga sentença monocrática, pois, sentença, por definição é monocrática. Ao mencionar decisão do juízo a quo, diga apenas sentença ou decisão recorrida. Não mencione o nome por extenso da parte autora. Inicie com \"Trata-se de recurso interposto pela parte autora\" (ou pelo INSS ...).Não diga \"Trata-se de recurso interposto contra sentença\", diga \"Trata-se de recurso interposto de sentença ...\" Não esqueça de relatar qual é o pedido final formulado no recurso ao final do texto que você escreverá. Segue o texto do recurso para sua análise:"""
-        full_prompt = f"{prompt}\n\n{text_content}"
-
         generation_config = genai.GenerationConfig(
             temperature=1.0,
             top_p=0.95,
@@ -85,54 +291,59 @@ def process_with_gemini(text_content: str, output_dir: Path, pdf_name: str,
             max_output_tokens=8192,
         )
 
-        print(f"\n{'='*80}\nStage 1: Generating initial response with Gemini\n{'='*80}\n")
+        log_section("Stage 1: Generating initial response with Gemini (%s)", base_name)
 
-        full_response = ""
-        response = model.generate_content(
-            full_prompt,
-            generation_config=generation_config,
-            stream=True
-        )
+        cache_key = response_cache_key(model.model_name, _PROMPT_STAGE1, text_content)
+        full_response = load_cached_response(output_dir, cache_key)
 
-        for chunk in response:
-            #  Handle the chunk.text more robustly.  It *could* be None.
-            if hasattr(chunk, 'text') and chunk.text:
-                print(chunk.text, end="")
-                full_response += chunk.text
-            #  No need to catch an exception *here* specifically. Let the outer
-            #  try/except handle it.  The key is that full_response is ""
-            #  if there was *any* problem.
-
-        print(f"\n{'='*80}\n")
+        if full_response is not None:
+            log.info("Using cached response.")
+            log.debug("%s", full_response)
+        else:
+            with _request_slots:
+                response = model.generate_content(
+                    text_content,
+                    generation_config=generation_config,
+                    stream=True
+                )
+                #  No need to catch an exception *here* specifically. Let the outer
+                #  try/except handle it.  The key is that "" is returned if
+                #  there was *any* problem.
+                full_response = collect_stream(response)
+
+            if full_response:
+                save_cached_response(output_dir, cache_key, full_response)
+
+        log.info("\n%s\n", _RULE)
 
-        timestamp = generate_timestamp()
-        base_name = Path(pdf_name).stem  # Use pathlib for consistent filename handling
         filename = f"{process_number or base_name}_{timestamp}.txt" # Much cleaner filename construction
         filepath = output_dir / filename
 
-        with open(filepath, 'w', encoding='utf-8') as file:
-            file.write(full_response)
+        filepath.write_text(full_response, encoding='utf-8')
 
-        print(f"Initial response saved to: {filepath}")
+        log.info("Initial response saved to: %s", filepath)
         return full_response
 
     except Exception as e:
-        print(f"Error processing with Gemini API: {e}") # Log the error.
+        log.error("Error processing with Gemini API: %s", e)
         return ""  # Consistent error handling:  Always return "" on error.
 
 
 def review_with_gemini_pro(initial_response: str, output_dir: Path,
-                          process_number: Optional[str], pdf_name: str,
-                          api_key: str) -> None:
+                          process_number: Optional[str], base_name: str,
+                          timestamp: str, model: genai.GenerativeModel,
+                          top_k: int) -> None:
     """
-    Review and improves the initial response using the Gemini Pro model.
+    Review and improves the initial response using a Gemini model.
 
     Args:
         initial_response: The response from the first API call.
         output_dir: Directory to save the output.
         process_number: The process number for the filename.
-        pdf_name: Name of the original PDF file (for fallback filename).
-        api_key: The API key to use for Gemini.
+        base_name: PDF file name without extension (for fallback filename).
+        timestamp: Timestamp shared by all output files of this PDF.
+        model: Configured Gemini model for the review stage.
+        top_k: Sampling top_k suited to the chosen model.
 
     Returns:
         None. Prints and saves the improved response.
@@ -140,110 +351,223 @@ def review_with_gemini_pro(initial_response: str, output_dir: Path,
     #  Very similar structure to process_with_gemini.  Consider refactoring
     #  to avoid code duplication (see DRY principle below).
     try:
-        print(f"\n{'='*80}\nStage 2: Reviewing and improving the response with Gemini Pro\n{'='*80}\n")
-
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel("gemini-2.0-pro-exp-02-05")  # Consider model as parameter
-
-        review_prompt = """Atue como um excelente assistente jurídico de um juiz federal. Sua função é apenas aprimorar o texto a seguir. Não é preciso expandi-lo ou transforma-lo em uma petição. O texto deve iniciar com Trata-se de recurso inominado interposto por ... de sentença ... Você deve apenas aprimorar a redação, principalmente evitando repetições. O texto a seguir constitui um resumo, uma listagem dos principais argumentos de um recurso. Elimine repetições que prejudiquem a boa leitura do texto. Não utilize itens, tópicos ou markdown na resposta. Não utilize \"juiz de piso\" ou \"sentença de piso\". Se encontrar essas expressões, substitua-as por Juízo de origem ou sentença ou sentença recorrida. """
-        full_prompt = f"{review_prompt}\n\n{initial_response}"
+        log_section("Stage 2: Reviewing and improving the response with Gemini (%s)", base_name)
 
         generation_config = genai.GenerationConfig(
             temperature=1.0,
             top_p=0.95,
-            top_k=64,  # Different top_k, consider making this a parameter
+            top_k=top_k,
             max_output_tokens=8192,
         )
 
-        improved_response = ""
-        response = model.generate_content(
-            full_prompt,
-            generation_config=generation_config,
-            stream=True
-        )
+        cache_key = response_cache_key(model.model_name, _PROMPT_STAGE2, initial_response)
+        improved_response = load_cached_response(output_dir, cache_key)
+
+        if improved_response is not None:
+            log.info("Using cached response.")
+            log.debug("%s", improved_response)
+        else:
+            with _request_slots:
+                response = model.generate_content(
+                    initial_response,
+                    generation_config=generation_config,
+                    stream=True
+                )
+                improved_response = collect_stream(response)
 
-        for chunk in response:
-              if hasattr(chunk, 'text') and chunk.text:
-                print(chunk.text, end="")
-                improved_response += chunk.text
+            if improved_response:
+                save_cached_response(output_dir, cache_key, improved_response)
 
-        print(f"\n{'='*80}\n")
+        log.info("\n%s\n", _RULE)
 
-        timestamp = generate_timestamp()
-        base_name = Path(pdf_name).stem
         filename = f"{process_number or base_name}_improved_{timestamp}.txt"
         filepath = output_dir / filename
 
-        with open(filepath, 'w', encoding='utf-8') as file:
-            file.write(improved_response)
+        filepath.write_text(improved_response, encoding='utf-8')
 
-        print(f"Improved response saved to: {filepath}")
+        log.info("Improved response saved to: %s", filepath)
 
     except Exception as e:
-        print(f"Error in second-stage processing: {e}") # Log the error.
+        log.error("Error in second-stage processing: %s", e)
         #  No return value needed, as the function is void.
 
 
 
+def needs_review(initial_response: str) -> bool:
+    """
+    Decide whether the first-stage response is worth a review call.
+
+    Short responses with no repeated sentences and none of the expressions
+    the review prompt rewrites gain little from the second stage.
+
+    Args:
+        initial_response: The response from the first API call.
+
+    Returns:
+        True if the review stage should run, False if it can be skipped.
+    """
+    if len(initial_response) >= REVIEW_SKIP_MAX_CHARS:
+        return True
+    if _PISO_RE.search(initial_response):
+        return True
+
+    sentences = [s for s in _SENTENCE_SPLIT_RE.split(initial_response.strip()) if s]
+    if not sentences or len(sentences) >= REVIEW_SKIP_MAX_SENTENCES:
+        return True
+    return len(set(sentences)) / len(sentences) <= REVIEW_SKIP_MIN_UNIQUE_RATIO
+
+
+def process_pdf(pdf_path: Path, output_dir: Path,
+                stage1_model: genai.GenerativeModel,
+                stage2_model: genai.GenerativeModel,
+                light_review_model: genai.GenerativeModel,
+                light_review_max_chars: int,
+                review_executor: ThreadPoolExecutor) -> Optional[Future]:
+    """
+    Run extraction and the first stage for one PDF, then queue its review.
+
+    The review is submitted to a separate executor so this worker can move
+    on to the next PDF while the review call is still in flight.
+
+    Args:
+        pdf_path: Path to the PDF file.
+        output_dir: Directory to save the output.
+        stage1_model: Gemini model for the first-stage analysis.
+        stage2_model: Gemini model for the review stage.
+        light_review_model: Lighter Gemini model for reviewing short responses.
+        light_review_max_chars: Responses shorter than this use light_review_model.
+        review_executor: Executor that runs the review stage.
+
+    Returns:
+        Future for the queued review, or None if the PDF or its review was
+        skipped.
+    """
+    log.info("\nProcessing: %s", pdf_path.name)
+    text_content = extract_text_from_pdf(pdf_path)
+
+    if not text_content:
+        log.warning("Skipping %s: No text content extracted.", pdf_path.name)
+        return None
+
+    log.info("Successfully extracted %d characters from %s.", len(text_content), pdf_path.name)
+
+    process_number = extract_process_number(text_content)
+    if process_number:
+        log.info("Process number extracted from PDF: %s", process_number)
+    else:
+        log.info("No process number found in %s.", pdf_path.name)
+
+    if len(text_content) > MAX_CHARS:
+        log.info("Truncating %s from %d to about %d characters.", pdf_path.name, len(text_content), MAX_CHARS)
+        text_content = truncate_text(text_content)
+
+    # Both stages share one timestamp so their output files can be matched.
+    timestamp = generate_timestamp()
+    initial_response = process_with_gemini(text_content, output_dir,
+                                           pdf_path.stem, process_number,
+                                           timestamp, stage1_model)
+
+    if not initial_response:
+        return None
+
+    if not needs_review(initial_response):
+        log.info("Skipping review for %s: initial response is short and has no repetitions.", pdf_path.name)
+        return None
+
+    # Short responses do not need the heavier (and pricier) review model.
+    if len(initial_response) < light_review_max_chars:
+        # flash-lite's documented default top_k is 40, as in stage 1.
+        review_model, review_top_k = light_review_model, 40
+    else:
+        review_model, review_top_k = stage2_model, 64
+
+    return review_executor.submit(review_with_gemini_pro, initial_response, output_dir,
+                                  process_number, pdf_path.stem, timestamp,
+                                  review_model, review_top_k)
+
+
 def main():
     """
     Main function to process all PDF files in the 'docs' folder.
     """
+    parser = argparse.ArgumentParser(
+        description="Summarize the appeals in the 'docs' folder with Gemini."
+    )
+    parser.add_argument(
+        "--light-review-max-chars", type=int, default=LIGHT_REVIEW_MAX_CHARS,
+        help="review first-stage responses shorter than this many characters "
+             "with the lighter flash-lite model instead of the Pro model "
+             "(default: %(default)s; 0 always uses the Pro model)"
+    )
+    args = parser.parse_args()
+
+    # Set LOGLEVEL=DEBUG to also print the model responses as they arrive.
+    level_name = os.environ.get("LOGLEVEL", "INFO").upper()
+    level = getattr(logging, level_name, None)
+    logging.basicConfig(level=level if isinstance(level, int) else logging.INFO,
+                        format="%(message)s", stream=sys.stdout)
+    if not isinstance(level, int):
+        log.warning("Unknown LOGLEVEL '%s'; using INFO.", level_name)
+
     load_dotenv()
     api_key = os.environ.get("GEMINI_API_KEY")
 
     if not api_key:
-        print("Error: GEMINI_API_KEY environment variable is not set.")
-        print("Please add it to your .env file as: GEMINI_API_KEY=your-api-key")
+        log.error("Error: GEMINI_API_KEY environment variable is not set.")
+        log.error("Please add it to your .env file as: GEMINI_API_KEY=your-api-key")
         return
 
+    # Configure the SDK and build the models once; they are shared by all
+    # workers instead of being recreated for every PDF.  The static prompts
+    # go in as system instructions so only the document text varies per call.
+    genai.configure(api_key=api_key)
+    stage1_model = genai.GenerativeModel("gemini-2.0-flash-lite",
+                                         system_instruction=_PROMPT_STAGE1)
+    stage2_model = genai.GenerativeModel("gemini-2.0-pro-exp-02-05",
+                                         system_instruction=_PROMPT_STAGE2)
+    light_review_model = genai.GenerativeModel("gemini-2.0-flash-lite",
+                                               system_instruction=_PROMPT_STAGE2)
+
     current_dir = Path.cwd()
     docs_dir = current_dir / "docs"
     output_dir = current_dir / "responses"
 
     if not docs_dir.exists():
-        print(f"Error: Directory '{docs_dir}' does not exist.")
-        print(f"Creating the directory '{docs_dir}'.")
+        log.error("Error: Directory '%s' does not exist.", docs_dir)
+        log.info("Creating the directory '%s'.", docs_dir)
         docs_dir.mkdir(parents=True, exist_ok=True)  # Create parent dirs if needed
-        print(f"Please place your PDF files in the '{docs_dir}' directory and run the script again.")
+        log.info("Please place your PDF files in the '%s' directory and run the script again.", docs_dir)
         return
 
     output_dir.mkdir(exist_ok=True)
-    print(f"Output will be saved to '{output_dir}'.")
+    log.info("Output will be saved to '%s'.", output_dir)
 
-    pdf_files = list(docs_dir.glob("*.pdf"))
+    # A single scandir pass: entry types come from the directory listing, so
+    # no per-file stat or pattern matching is needed.
+    with os.scandir(docs_dir) as entries:
+        pdf_files = [Path(entry.path) for entry in entries
+                     if entry.is_file() and entry.name.lower().endswith(".pdf")]
 
     if not pdf_files:
-        print(f"No PDF files found in '{docs_dir}'.")
+        log.info("No PDF files found in '%s'.", docs_dir)
         return
 
-    print(f"Found {len(pdf_files)} PDF file(s) in '{docs_dir}'.")
-
-    for pdf_path in pdf_files:
-        print(f"\nProcessing: {pdf_path.name}")
-        text_content = extract_text_from_pdf(pdf_path)
-
-        if not text_content:
-            print(f"Skipping {pdf_path.name}: No text content extracted.")
-            continue
-
-        print(f"Successfully extracted {len(text_content)} characters from {pdf_path.name}.")
-
-        process_number = extract_process_number(text_content)
-        if process_number:
-            print(f"Process number extracted from PDF: {process_number}")
-        else:
-            print("No process number found in the PDF content.")
-
-        initial_response = process_with_gemini(text_content, output_dir,
-                                              pdf_path.name, process_number,
-                                              api_key)
-
-        if initial_response:
-            review_with_gemini_pro(initial_response, output_dir,
-                                  process_number, pdf_path.name, api_key)
-
-    print("\nAll PDF files processed.")
+    log.info("Found %d PDF file(s) in '%s'.", len(pdf_files), docs_dir)
+
+    # Stage 1 and stage 2 get their own pools, so reviews of finished PDFs
+    # overlap with the first stage of the next ones.  Leaving the block waits
+    # for the first stages, then for every queued review.
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as review_executor, \
+         ThreadPoolExecutor(max_workers=MAX_WORKERS) as stage1_executor:
+        list(stage1_executor.map(partial(process_pdf, output_dir=output_dir,
+                                         stage1_model=stage1_model,
+                                         stage2_model=stage2_model,
+                                         light_review_model=light_review_model,
+                                         light_review_max_chars=args.light_review_max_chars,
+                                         review_executor=review_executor),
+                                 pdf_files))
+
+    log.info("\nAll PDF files processed.")
 
 
 if __name__ == "__main__":